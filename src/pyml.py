@@ -8,260 +8,461 @@ import re
 import sys
 import subprocess
 import os
-from typing import List, Tuple
+import hashlib
+import marshal
+import tempfile
+import linecache
+import traceback
+from typing import Iterator, List, Match, Tuple
 from functools import lru_cache
+from types import CodeType, MappingProxyType, ModuleType
 
-# Pre-compiled regex patterns
-PATTERNS = {
-    'function_def': re.compile(r'function\s+(\w+)\s+define\s+(.+?)\s*:'),
-    'for_range': re.compile(r'for\s+(\w+)\s+in\s+range\.(.+?)\s*:'),
-    'for_regular': re.compile(r'for\s+([\w,\s]+)\s+in\s+(\w+)\s*:'),
-    'assignment': re.compile(r'^(\w+)\s*:\s*(.+)$'),
-    'print_stmt': re.compile(r'^print:\s*(.*)$'),
+# Compiled scripts are cached here, keyed by source, path and transpiler digest
+CACHE_DIR = os.path.join(os.environ.get('XDG_CACHE_HOME') or os.path.expanduser('~/.cache'), 'pyml')
+
+# Set PYML_NO_CACHE to transpile and compile every run without touching CACHE_DIR
+CACHE_ENABLED = not os.environ.get('PYML_NO_CACHE')
+
+# Pre-compiled line dispatcher: one alternation, branch on ``lastgroup``
+DISPATCH_RE = re.compile(
+    r'(?P<packages>packages:$)'
+    r'|(?P<function>function\s+(?P<func_name>\w+)\s+define\s+(?P<func_args>.+?)\s*:)'
+    r'|(?P<for_range>for\s+(?P<range_var>\w+)\s+in\s+range\.(?P<range_vals>.+?)\s*:)'
+    r'|(?P<for_regular>for\s+(?P<for_vars>[\w,\s]+)\s+in\s+(?P<for_iter>\w+)\s*:)'
+    r'|(?P<print>print:)'
+)
+
+# First characters DISPATCH_RE can match; other lines skip the regex engine
+_DISPATCH_FIRST = 'pf'
+
+# for ... in range.<args>: loop headers, indexed by number of args
+_RANGE_FMTS = (
+    None,
+    "{i}for {v} in range({0}):\n",
+    "{i}for {v} in range({0}, {1}):\n",
+    "{i}for {v} in range({0}, {1}, {2}):\n",
+)
+
+# Opening characters of a string literal; a set, so '' is not a member
+_QUOTES = frozenset('"\'')
+
+# Text around print: arguments, indexed by (is string literal << 1) | has {placeholders}
+_PRINT_WRAPS = (
+    ("print(", ")\n"),
+    ('print(f"', '")\n'),
+    ("print(", ")\n"),
+    ("print(f", ")\n"),
+)
+
+# Control-flow keywords whose trailing colon is not an assignment
+_CONTROL_PREFIXES = ('if ', 'elif ', 'else:', 'while ', 'try:', 'except', 'finally:', 'with ', 'for ')
+
+# Line kinds produced by PyMLTranspiler._tokenize
+(BLANK, PACKAGES, FUNCTION, FOR_RANGE, FOR_REGULAR,
+ PRINT, ASSIGN, CALL, OTHER) = range(9)
+
+_GROUP_KINDS = {
+    'packages': PACKAGES,
+    'function': FUNCTION,
+    'for_range': FOR_RANGE,
+    'for_regular': FOR_REGULAR,
+    'print': PRINT,
 }
 
+
+class _IndentTable(dict):
+    """Indentation strings keyed by width, built on first use"""
+    
+    def __missing__(self, width: int) -> str:
+        indent = self[width] = " " * width
+        return indent
+
+
+_INDENTS = _IndentTable()
+
+# Any reference to the sys module in generated code
+_SYS_REF_RE = re.compile(r'\bsys\b')
+
+# Emitted lines buffered by transpile_iter before it yields them
+_FLUSH_LINES = 512
+
+# Packages with a hand-picked import statement
+IMPORT_OVERRIDES = MappingProxyType({
+    'time.sleep': 'from time import sleep',
+})
+
+
+@lru_cache(maxsize=1024)
+def _get_import(pkg: str) -> str:
+    """Convert package name to import statement"""
+    return IMPORT_OVERRIDES.get(pkg) or _import_from_path(pkg)
+
+
+@lru_cache(maxsize=128)
+def _import_block(packages: Tuple[str, ...]) -> str:
+    """Build the import section for packages, in the order given"""
+    if not packages:
+        return ""
+    return "\n".join([_get_import(pkg) for pkg in packages]) + "\n"
+
+
+def _import_from_path(pkg: str) -> str:
+    """Derive the import statement from a dotted package path"""
+    module, _, name = pkg.rpartition('.')
+    if not module:
+        return f"import {pkg}"
+    return f"from {module} import {name}"
+
+
 class PyMLTranspiler:
     """Clean, maintainable PyML to Python transpiler"""
     
     def __init__(self):
-        self.imports = set()
+        # Insertion-ordered set: imports are emitted in source order
+        self.imports = {}
         self.output = []
+        self._emit = self.output.append
+        # Indexed by line kind
+        self._handlers = (
+            self._handle_blank,
+            self._handle_packages,
+            self._handle_function,
+            self._handle_for_range,
+            self._handle_for_regular,
+            self._handle_print,
+            self._handle_assignment,
+            self._handle_call,
+            self._handle_other,
+        )
         
+    def reset(self):
+        """Clear per-file state so the instance can transpile another file"""
+        self.output.clear()
+        self.imports.clear()
+    
     def transpile(self, lines: List[str]) -> str:
         """Main transpilation function"""
-        # Add standard imports
-        self.output.append("import sys\n")
+        return "".join(self.transpile_iter(lines))
+    
+    def transpile_iter(self, lines: List[str]) -> Iterator[str]:
+        """Yield the transpiled source in chunks, imports first"""
+        # Classify every line once; the main loop only branches on its kind
+        self._indents, self._stripped, kinds, payloads = self._tokenize(lines)
         
-        i = 0
-        while i < len(lines):
-            i = self._process_line(lines, i)
+        # The import header leads the output, so resolve every packages:
+        # section the main loop will reach up front. Generated code only
+        # mentions sys if the source does.
+        i = -1
+        while True:
+            try:
+                i = kinds.index(PACKAGES, i + 1)
+            except ValueError:
+                break
+            if not self._in_consumed_block(i, kinds):
+                self._handle_packages(payloads[i], lines, i, "")
+        if _SYS_REF_RE.search("\n".join(self._stripped)):
+            yield "import sys\n"
+        yield _import_block(tuple(self.imports))
         
-        # Add user imports at the top (after sys import)
-        if self.imports:
-            imports_code = "\n".join(self._get_import(pkg) for pkg in sorted(self.imports))
-            self.output.insert(1, imports_code + "\n")
+        indents = self._indents
+        indent_strs = _INDENTS
+        handlers = self._handlers
+        output = self.output
         
-        return "".join(self.output)
-    
-    def _process_line(self, lines: List[str], i: int) -> int:
-        """Process a single line and return next index"""
-        line = lines[i]
-        stripped = line.strip()
-        indent = self._get_indent(line)
+        n = len(lines)
+        i = 0
+        while i < n:
+            i = handlers[kinds[i]](payloads[i], lines, i, indent_strs[indents[i]])
+            if len(output) >= _FLUSH_LINES:
+                yield "".join(output)
+                output.clear()
         
-        # Skip empty lines and comments
-        if not stripped or stripped.startswith('#'):
-            self.output.append(line + "\n")
-            return i + 1
+        yield "".join(output)
+        output.clear()
+    
+    def _tokenize(self, lines: List[str]) -> Tuple[List[int], List[str], List[int], List[object]]:
+        """Split lines into parallel indent, stripped text, kind and payload arrays
         
-        # Packages section
-        if stripped == 'packages:':
-            return self._handle_packages(lines, i)
+        The payload is the DISPATCH_RE match for dispatched kinds, the offset
+        of the first colon for assignments, and None otherwise.
+        """
+        indents = [len(line) - len(line.lstrip()) for line in lines]
+        stripped_lines = list(map(str.strip, lines))
+        kinds = []
+        payloads = []
+        add_kind = kinds.append
+        add_payload = payloads.append
+        match_line = DISPATCH_RE.match
+        dispatch_first = _DISPATCH_FIRST
         
-        # Function definition
-        if stripped.startswith('function '):
-            self._handle_function(stripped, indent)
-            return i + 1
+        for stripped in stripped_lines:
+            payload = None
+            if not stripped or stripped[0] == '#':
+                kind = BLANK
+            else:
+                # Packages, function definitions, for loops and print statements
+                if stripped[0] in dispatch_first:
+                    payload = match_line(stripped)
+                if payload:
+                    kind = _GROUP_KINDS[payload.lastgroup]
+                else:
+                    sep = stripped.find(':')
+                    if sep != -1 and not stripped.startswith(_CONTROL_PREFIXES):
+                        kind = ASSIGN
+                        payload = sep
+                    elif stripped.endswith(';'):
+                        kind = CALL
+                    else:
+                        kind = OTHER
+            add_kind(kind)
+            add_payload(payload)
         
-        # For loops
-        if stripped.startswith('for '):
-            self._handle_for_loop(stripped, indent)
-            return i + 1
+        return indents, stripped_lines, kinds, payloads
+    
+    def _block_end(self, i: int) -> int:
+        """Index of the first non-blank line after i indented no deeper than i"""
+        indents = self._indents
+        stripped_lines = self._stripped
+        base_indent = indents[i]
         
-        # Print statement
-        if stripped.startswith('print:'):
-            self._handle_print(stripped, indent)
-            return i + 1
+        for j in range(i + 1, len(indents)):
+            if indents[j] <= base_indent and stripped_lines[j]:
+                return j
+        return len(indents)
+    
+    def _in_consumed_block(self, i: int, kinds: List[int]) -> bool:
+        """Whether line i lies in a packages: or YAML block the main loop skips over"""
+        indents = self._indents
+        stripped_lines = self._stripped
+        level = indents[i]
+        j = i - 1
         
-        # Assignment (with potential YAML structures)
-        if ':' in stripped and not self._is_control_flow(stripped):
-            return self._handle_assignment(lines, i, stripped, indent)
+        # Walk up the enclosing lines, nearest first
+        while level and j >= 0:
+            if indents[j] < level and stripped_lines[j]:
+                kind = kinds[j]
+                if kind == PACKAGES:
+                    return True
+                if kind == ASSIGN and indents[j + 1] > indents[j]:
+                    next_stripped = stripped_lines[j + 1]
+                    if next_stripped.startswith('-') or ':' in next_stripped:
+                        return True
+                level = indents[j]
+            j -= 1
+        return False
+    
+    def _list_items(self, i: int) -> Tuple[List[str], int]:
+        """Non-empty "- item" values in the block under line i, and its end"""
+        end = self._block_end(i)
+        items = []
         
-        # Function call (ends with semicolon)
-        if stripped.endswith(';'):
-            self.output.append(f"{indent}{stripped[:-1]}()\n")
-            return i + 1
+        for line_stripped in self._stripped[i + 1:end]:
+            if line_stripped.startswith('-'):
+                item = line_stripped[1:].lstrip()
+                if item:
+                    items.append(item)
         
-        # Everything else (if/elif/else/while/expressions)
-        self.output.append(f"{indent}{stripped}\n")
+        return items, end
+    
+    def _handle_blank(self, payload: None, lines: List[str], i: int, indent: str) -> int:
+        """Copy empty lines and comments through"""
+        self._emit(lines[i] + "\n")
+        return i + 1
+    
+    def _handle_call(self, payload: None, lines: List[str], i: int, indent: str) -> int:
+        """Handle function call (ends with semicolon)"""
+        self._emit(f"{indent}{self._stripped[i][:-1]}()\n")
         return i + 1
     
-    def _handle_packages(self, lines: List[str], i: int) -> int:
+    def _handle_other(self, payload: None, lines: List[str], i: int, indent: str) -> int:
+        """Handle everything else (if/elif/else/while/expressions)"""
+        self._emit(f"{indent}{self._stripped[i]}\n")
+        return i + 1
+    
+    def _handle_packages(self, match: Match, lines: List[str], i: int, indent: str) -> int:
         """Handle packages: section"""
-        base_indent = self._get_indent_level(lines[i])
-        j = i + 1
+        packages, end = self._list_items(i)
         
-        while j < len(lines):
-            stripped = lines[j].strip()
-            indent_level = self._get_indent_level(lines[j])
-            
-            if indent_level <= base_indent and stripped:
-                break
-            
-            if stripped.startswith('-'):
-                pkg = stripped[1:].strip()
-                if pkg:
-                    self.imports.add(pkg)
-            j += 1
+        for pkg in packages:
+            self.imports[pkg] = None
         
-        return j
+        return end
     
-    def _handle_function(self, stripped: str, indent: str):
+    def _handle_function(self, match: Match, lines: List[str], i: int, indent: str) -> int:
         """Handle function definition"""
-        match = PATTERNS['function_def'].match(stripped)
-        if match:
-            name, args = match.groups()
-            args = args.strip()
-            if args == "_":
-                args = ""
-            self.output.append(f"{indent}def {name}({args}):\n")
-    
-    def _handle_for_loop(self, stripped: str, indent: str):
-        """Handle for loops"""
-        # Range-based loop
-        match = PATTERNS['for_range'].match(stripped)
-        if match:
-            var, range_vals = match.groups()
-            parts = range_vals.split('.')
-            
-            if len(parts) == 1:
-                self.output.append(f"{indent}for {var} in range({parts[0]}):\n")
-            elif len(parts) == 2:
-                self.output.append(f"{indent}for {var} in range({parts[0]}, {parts[1]}):\n")
-            elif len(parts) == 3:
-                self.output.append(f"{indent}for {var} in range({parts[0]}, {parts[1]}, {parts[2]}):\n")
-            return
+        name = match.group('func_name')
+        args = match.group('func_args').strip()
+        if args == "_":
+            args = ""
+        self._emit(f"{indent}def {name}({args}):\n")
+        return i + 1
+    
+    def _handle_for_range(self, match: Match, lines: List[str], i: int, indent: str) -> int:
+        """Handle range-based for loops"""
+        var, range_vals = match.group('range_var', 'range_vals')
+        parts = range_vals.split('.')
         
-        # Regular for loop
-        match = PATTERNS['for_regular'].match(stripped)
-        if match:
-            vars_part, collection = match.groups()
-            vars_part = vars_part.strip()
-            
-            if ',' in vars_part:
-                self.output.append(f"{indent}for {vars_part} in {collection}.items():\n")
-            else:
-                self.output.append(f"{indent}for {vars_part} in {collection}:\n")
+        if len(parts) > 3:
+            raise SyntaxError("range takes at most 3 values: range.start.stop.step",
+                              (None, i + 1, 1, self._stripped[i]))
+        self._emit(_RANGE_FMTS[len(parts)].format(*parts, i=indent, v=var))
+        return i + 1
     
-    def _handle_print(self, stripped: str, indent: str):
-        """Handle print statements"""
-        content = stripped[6:].strip()
+    def _handle_for_regular(self, match: Match, lines: List[str], i: int, indent: str) -> int:
+        """Handle for loops over a collection"""
+        vars_part, collection = match.group('for_vars', 'for_iter')
+        vars_part = vars_part.strip()
         
-        if not content:
-            self.output.append(f"{indent}print()\n")
-        elif content.startswith('"') or content.startswith("'"):
-            # String literal - check for f-string
-            if '{' in content and '}' in content:
-                self.output.append(f"{indent}print(f{content})\n")
-            else:
-                self.output.append(f"{indent}print({content})\n")
-        elif '{' in content and '}' in content:
-            # Expression with variables
-            self.output.append(f'{indent}print(f"{content}")\n')
+        if ',' in vars_part:
+            self._emit(f"{indent}for {vars_part} in {collection}.items():\n")
         else:
-            # Variable or expression
-            self.output.append(f"{indent}print({content})\n")
+            self._emit(f"{indent}for {vars_part} in {collection}:\n")
+        return i + 1
     
-    def _handle_assignment(self, lines: List[str], i: int, stripped: str, indent: str) -> int:
+    def _handle_print(self, match: Match, lines: List[str], i: int, indent: str) -> int:
+        """Handle print statements"""
+        content = match.string[match.end():].lstrip()
+        
+        # Placeholders turn a string literal into an f-string and wrap a bare
+        # expression in one; an empty print: falls through to print()
+        flags = (content[:1] in _QUOTES) << 1 | ('{' in content and '}' in content)
+        head, tail = _PRINT_WRAPS[flags]
+        self._emit(f"{indent}{head}{content}{tail}")
+        return i + 1
+    
+    def _handle_assignment(self, sep: int, lines: List[str], i: int, indent: str) -> int:
         """Handle variable assignments including YAML structures"""
-        parts = stripped.split(':', 1)
-        if len(parts) != 2:
-            self.output.append(f"{indent}{stripped}\n")
+        stripped = self._stripped[i]
+        
+        # sep comes from _tokenize; only the inner sides need trimming
+        var_name = stripped[:sep].rstrip()
+        value = stripped[sep + 1:].lstrip()
+        indents = self._indents
+        stripped_lines = self._stripped
+        base_indent_level = indents[i]
+        
+        # Simple assignment: only a deeper-indented next line can start YAML
+        if i + 1 >= len(lines) or indents[i + 1] <= base_indent_level:
+            if value:
+                self._emit(f"{indent}{var_name} = {value}\n")
             return i + 1
         
-        var_name = parts[0].strip()
-        value = parts[1].strip()
-        base_indent_level = self._get_indent_level(lines[i])
+        # Next line is indented deeper: YAML list or dictionary
+        next_stripped = stripped_lines[i + 1]
+        
+        # YAML list
+        if next_stripped.startswith('-'):
+            items, end = self._list_items(i)
+            self._emit(f"{indent}{var_name} = [{', '.join(items)}]\n")
+            return end
         
-        # Check if next line is indented (YAML structure)
-        if i + 1 < len(lines):
-            next_line = lines[i + 1]
-            next_stripped = next_line.strip()
-            next_indent = self._get_indent_level(next_line)
+        # YAML dictionary
+        elif ':' in next_stripped:
+            items = []
+            end = self._block_end(i)
             
-            # YAML list
-            if next_indent > base_indent_level and next_stripped.startswith('-'):
-                items = []
-                j = i + 1
-                
-                while j < len(lines):
-                    line_stripped = lines[j].strip()
-                    line_indent = self._get_indent_level(lines[j])
-                    
-                    if line_indent <= base_indent_level:
-                        break
-                    
-                    if line_stripped.startswith('-'):
-                        item = line_stripped[1:].strip()
-                        if item:
-                            items.append(item)
-                    j += 1
-                
-                self.output.append(f"{indent}{var_name} = [{', '.join(items)}]\n")
-                return j
+            for line_stripped in stripped_lines[i + 1:end]:
+                sep = line_stripped.find(':')
+                if sep != -1:
+                    key = line_stripped[:sep].rstrip()
+                    val = line_stripped[sep + 1:].lstrip()
+                    items.append(f"'{key}': {val}")
             
-            # YAML dictionary
-            elif next_indent > base_indent_level and ':' in next_stripped:
-                items = []
-                j = i + 1
-                
-                while j < len(lines):
-                    line_stripped = lines[j].strip()
-                    line_indent = self._get_indent_level(lines[j])
-                    
-                    if line_indent <= base_indent_level:
-                        break
-                    
-                    if ':' in line_stripped:
-                        key_val = line_stripped.split(':', 1)
-                        if len(key_val) == 2:
-                            key = key_val[0].strip()
-                            val = key_val[1].strip()
-                            items.append(f"'{key}': {val}")
-                    j += 1
-                
-                if items:
-                    self.output.append(f"{indent}{var_name} = {{{', '.join(items)}}}\n")
-                    return j
+            # Line i + 1 is in the block and has a colon, so items is never empty
+            self._emit(f"{indent}{var_name} = {{{', '.join(items)}}}\n")
+            return end
         
         # Simple assignment
         if value:
-            self.output.append(f"{indent}{var_name} = {value}\n")
+            self._emit(f"{indent}{var_name} = {value}\n")
         
         return i + 1
+
+
+# One instance serves every file transpiled by this process
+_TRANSPILER = PyMLTranspiler()
+
+
+def _shared_transpiler() -> PyMLTranspiler:
+    """The shared transpiler, reset for a new file. Not thread-safe"""
+    _TRANSPILER.reset()
+    return _TRANSPILER
+
+
+def transpile_file(file_path: str) -> str:
+    """Transpile a PyML file, reusing one shared transpiler between calls.
     
-    @staticmethod
-    def _get_indent(line: str) -> str:
-        """Get indentation string from line"""
-        return line[:len(line) - len(line.lstrip())]
-    
-    @staticmethod
-    def _get_indent_level(line: str) -> int:
-        """Get indentation level (number of spaces)"""
-        return len(line) - len(line.lstrip())
-    
-    @staticmethod
-    def _is_control_flow(stripped: str) -> bool:
-        """Check if line is control flow"""
-        return stripped.startswith(('if ', 'elif ', 'else:', 'while ', 'try:', 'except', 'finally:', 'with '))
-    
-    @lru_cache(maxsize=64)
-    def _get_import(self, pkg: str) -> str:
-        """Convert package name to import statement"""
-        # Common optimizations
-        if pkg == 'time.sleep':
-            return 'from time import sleep'
-        
-        parts = pkg.split('.')
-        if len(parts) == 1:
-            return f"import {pkg}"
-        elif len(parts) == 2:
-            return f"from {parts[0]} import {parts[1]}"
-        else:
-            return f"from {'.'.join(parts[:-1])} import {parts[-1]}"
+    Not thread-safe: concurrent calls share the same instance.
+    """
+    with open(file_path, 'r', encoding='utf-8') as f:
+        lines = f.read().splitlines()
+    return _shared_transpiler().transpile(lines)
+
+
+@lru_cache(maxsize=1)
+def _transpiler_digest() -> bytes:
+    """Digest of this module and interpreter, so cache entries expire when either changes"""
+    with open(__file__, 'rb') as f:
+        digest = hashlib.blake2b(f.read(), digest_size=16)
+    # Marshalled code objects are only valid for the Python that wrote them,
+    # and compile() strips asserts and docstrings according to -O/-OO
+    digest.update(sys.implementation.cache_tag.encode())
+    digest.update(bytes((sys.flags.optimize,)))
+    return digest.digest()
+
+
+def _compile(text: str, file_path: str) -> Tuple[str, CodeType]:
+    """Transpile and compile text, returning the generated source and its code object"""
+    python_code = _shared_transpiler().transpile(text.splitlines())
+    # Line numbers refer to the generated code, so keep them apart from the .pyml file's
+    return python_code, compile(python_code, f"<pyml:{file_path}>", 'exec')
+
+
+def _compile_cached(source: bytes, text: str, file_path: str) -> Tuple[str, CodeType]:
+    """Like _compile, going through the on-disk cache keyed by source
+    
+    The path is part of the key because compile() records it as the code's
+    filename.
+    """
+    if not CACHE_ENABLED:
+        return _compile(text, file_path)
+    
+    key = hashlib.blake2b(source, digest_size=16, key=_transpiler_digest())
+    key.update(file_path.encode('utf-8', 'surrogateescape'))
+    cache_path = os.path.join(CACHE_DIR, key.hexdigest() + '.marshal')
+    
+    try:
+        with open(cache_path, 'rb') as f:
+            python_code, code = marshal.load(f)
+        # Anything else that unmarshals is a foreign or damaged entry: rebuild it
+        if isinstance(python_code, str) and isinstance(code, CodeType):
+            return python_code, code
+    except (OSError, EOFError, ValueError, TypeError):
+        pass
+    
+    python_code, code = _compile(text, file_path)
+    
+    # Best effort: write atomically, and never fail the run over the cache
+    try:
+        os.makedirs(CACHE_DIR, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=CACHE_DIR, suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                marshal.dump((python_code, code), f)
+            os.replace(tmp_path, cache_path)
+        except BaseException:
+            try:
+                os.remove(tmp_path)
+            except OSError:
+                pass
+            raise
+    except (OSError, ValueError):
+        pass
+    
+    return python_code, code
 
 
-def run_pyml(file_path: str, show_transpiled: bool = False):
+def run_pyml(file_path: str, show_transpiled: bool = False, isolate: bool = False):
     """Main runner function"""
     if not os.path.exists(file_path):
         print(f"Error: File '{file_path}' not found", file=sys.stderr)
@@ -269,44 +470,153 @@ def run_pyml(file_path: str, show_transpiled: bool = False):
     
     # Read PyML file
     try:
-        with open(file_path, 'r', encoding='utf-8') as f:
-            lines = f.readlines()
+        with open(file_path, 'rb') as f:
+            source = f.read()
+        text = source.decode('utf-8')
     except Exception as e:
         print(f"Error reading file: {e}", file=sys.stderr)
         sys.exit(1)
     
-    # Transpile
-    transpiler = PyMLTranspiler()
-    python_code = transpiler.transpile(lines)
-    
     # If --tr flag, show transpiled code and exit
     if show_transpiled:
         print("=== Transpiled Python Code ===")
-        print(python_code)
+        try:
+            sys.stdout.writelines(_shared_transpiler().transpile_iter(text.splitlines()))
+        except SyntaxError as e:
+            _exit_syntax_error(e, file_path)
+        print()
         return
     
-    # Create temporary Python file
-    base_name = os.path.splitext(os.path.basename(file_path))[0]
-    temp_file = f"_pyml_temp_{base_name}.py"
+    # Transpile and compile, or load the cached code for unchanged sources
+    try:
+        python_code, code = _compile_cached(source, text, file_path)
+    except SyntaxError as e:
+        _exit_syntax_error(e, file_path)
+    
+    # Register the generated source so tracebacks show the transpiled lines
+    linecache.cache[code.co_filename] = (len(python_code), None, python_code.splitlines(True), code.co_filename)
     
+    if isolate:
+        _run_isolated(file_path, python_code, code)
+    
+    # Execute in-process: no interpreter startup, temp file or stdout pipe
+    sys.argv = [file_path]
+    sys.path[0] = os.path.dirname(os.path.abspath(file_path))
+    
+    # Like runpy.run_path: the script is the real __main__ while it runs, so
+    # pickle and multiprocessing can find its functions by module name
+    main = ModuleType('__main__')
+    main.__file__ = file_path
+    runner_main = sys.modules['__main__']
+    sys.modules['__main__'] = main
     try:
-        # Write Python code
-        with open(temp_file, 'w', encoding='utf-8') as f:
-            f.write(python_code)
-        
-        # Execute
-        result = subprocess.run(
-            [sys.executable, temp_file],
-            capture_output=True,
-            text=True
-        )
-        
-        # Output results
-        if result.stdout:
-            print(result.stdout, end='')
+        exec(code, main.__dict__)
+    except SystemExit:
+        raise
+    except Exception as e:
+        # Drop this runner's frame, as if the script had run on its own
+        traceback.print_exception(type(e), e, e.__traceback__.tb_next)
+        sys.exit(1)
+    finally:
+        sys.modules['__main__'] = runner_main
+
+
+def run_pyml_serve():
+    """Run the PyML files named on stdin, one path per line, in this process
+    
+    Interpreter startup is paid for once. A script that fails or calls
+    sys.exit() only ends its own run. Scripts read from os.devnull, so input()
+    cannot swallow queued paths, and each starts from the runner's own
+    sys.modules, sys.path and sys.argv, so same-named modules next to
+    different scripts do not shadow each other.
+    """
+    paths = sys.stdin
+    for line in paths:
+        file_path = line.strip()
+        if not file_path:
+            continue
+        modules = dict(sys.modules)
+        path = sys.path[:]
+        argv = sys.argv
+        with open(os.devnull) as devnull:
+            sys.stdin = devnull
+            try:
+                run_pyml(file_path)
+            except SystemExit:
+                pass
+            finally:
+                sys.stdin = paths
+                sys.argv = argv
+                sys.path[:] = path
+                for name in sys.modules.keys() - modules.keys():
+                    del sys.modules[name]
+                sys.modules.update(modules)
+        sys.stdout.flush()
+        sys.stderr.flush()
+
+
+def _exit_syntax_error(e: SyntaxError, file_path: str):
+    """Report a PyML or generated-code syntax error and exit"""
+    if e.filename is None:
+        e.filename = file_path
+    traceback.print_exception(type(e), e, None)
+    sys.exit(1)
+
+
+# Child-side bootstrap for --isolate, mirroring run_pyml's in-process exec.
+# argv is [marshal file, script path]; the file holds (source, code).
+_ISOLATED_LOADER = (
+    "import linecache, marshal, os, sys, traceback, types\n"
+    "code_path, sys.argv = sys.argv[1], sys.argv[2:]\n"
+    "sys.path[0] = os.path.dirname(os.path.abspath(sys.argv[0]))\n"
+    "with open(code_path, 'rb') as f:\n"
+    "    source, code = marshal.load(f)\n"
+    "linecache.cache[code.co_filename] = (len(source), None, source.splitlines(True), code.co_filename)\n"
+    "main = sys.modules['__main__'] = types.ModuleType('__main__')\n"
+    "main.__file__ = sys.argv[0]\n"
+    "try:\n"
+    "    exec(code, main.__dict__)\n"
+    "except SystemExit:\n"
+    "    raise\n"
+    "except Exception as e:\n"
+    "    traceback.print_exception(type(e), e, e.__traceback__.tb_next)\n"
+    "    sys.exit(1)\n"
+)
+
+
+def _run_isolated(file_path: str, python_code: str, code: CodeType):
+    """Run compiled code in a separate interpreter, handed over through a file"""
+    # The child only unmarshals the code object: no tokenize/parse/compile
+    temp_file = None
+    
+    try:
+        fd = None
+        if hasattr(os, 'memfd_create'):
+            # Linux: an anonymous in-memory file the child reads through its copy of the fd
+            try:
+                fd = os.memfd_create('pyml')
+            except OSError:
+                # Blocked or missing at runtime (seccomp, gVisor, old kernels)
+                pass
+        if fd is not None:
+            code_path = f"/proc/self/fd/{fd}"
+            pass_fds = (fd,)
+        else:
+            fd, temp_file = tempfile.mkstemp(prefix='_pyml_', suffix='.marshal')
+            code_path = temp_file
+            pass_fds = ()
         
-        if result.stderr:
-            print(result.stderr, end='', file=sys.stderr)
+        # Write marshalled code object
+        with open(fd, 'wb') as f:
+            marshal.dump((python_code, code), f)
+            f.flush()
+            
+            # Execute; the child inherits stdio, so output streams as it is written
+            sys.stdout.flush()
+            result = subprocess.run(
+                [sys.executable, '-c', _ISOLATED_LOADER, code_path, file_path],
+                pass_fds=pass_fds
+            )
         
         sys.exit(result.returncode)
     
@@ -316,7 +626,7 @@ def run_pyml(file_path: str, show_transpiled: bool = False):
     
     finally:
         # Cleanup
-        if os.path.exists(temp_file):
+        if temp_file and os.path.exists(temp_file):
             try:
                 os.remove(temp_file)
             except:
@@ -326,13 +636,21 @@ def run_pyml(file_path: str, show_transpiled: bool = False):
 if __name__ == "__main__":
     if len(sys.argv) < 2:
         print("PyML Transpiler v2.0")
-        print("Usage: python pyml.py <file.pyml> [--tr]")
+        print("Usage: python pyml.py <file.pyml> [--tr] [--isolate]")
+        print("       python pyml.py --serve")
         print("Options:")
-        print("  --tr    Show transpiled Python code without executing")
+        print("  --tr         Show transpiled Python code without executing")
+        print("  --isolate    Execute in a separate Python process")
+        print("  --serve      Run the .pyml files named on stdin, one per line (scripts get no stdin)")
         sys.exit(1)
     
+    if '--serve' in sys.argv:
+        run_pyml_serve()
+        sys.exit(0)
+    
     # Parse arguments
     show_transpiled = '--tr' in sys.argv
+    isolate = '--isolate' in sys.argv
     pyml_file = None
     
     for arg in sys.argv[1:]:
@@ -344,4 +662,4 @@ if __name__ == "__main__":
         print("Error: No .pyml file specified", file=sys.stderr)
         sys.exit(1)
     
-    run_pyml(pyml_file, show_transpiled)
\ No newline at end of file
+    run_pyml(pyml_file, show_transpiled, isolate)
\ No newline at end of file